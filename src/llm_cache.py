@@ -0,0 +1,78 @@
+"""Persistent on-disk cache for LLM doc_type classifications.
+
+Classifications are stored in a small SQLite database keyed by a sha256 of
+the cache version, the model name and the doc_type, so re-runs only send
+unseen doc_types to the API and switching models invalidates previous answers.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "outputs" / ".llm_cache.sqlite"
+
+# Part of every key; bump to invalidate all existing entries (version 1 also
+# stored "MISC" placeholders for doc_types the LLM never answered)
+CACHE_VERSION = 2
+
+_connection: Optional[sqlite3.Connection] = None
+
+
+def _connect() -> sqlite3.Connection:
+    """Open (and create if needed) the cache database."""
+    global _connection
+    if _connection is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _connection = sqlite3.connect(str(CACHE_PATH))
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS classifications (key TEXT PRIMARY KEY, category TEXT NOT NULL)"
+        )
+        _connection.commit()
+    return _connection
+
+
+def make_key(model: str, doc_type: str) -> str:
+    """
+    Build the cache key for a doc_type classified by a given model.
+
+    Args:
+        model: Model name used for classification
+        doc_type: Original doc_type value
+
+    Returns:
+        Hex sha256 digest of "version|model|doc_type"
+    """
+    return hashlib.sha256(f"{CACHE_VERSION}|{model}|{doc_type}".encode('utf-8')).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """
+    Look up a cached category.
+
+    Args:
+        key: Cache key from make_key
+
+    Returns:
+        Cached category, or None on a miss
+    """
+    row = _connect().execute(
+        "SELECT category FROM classifications WHERE key = ?", (key,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set(key: str, category: str) -> None:
+    """
+    Store a category in the cache.
+
+    Args:
+        key: Cache key from make_key
+        category: Category returned by the LLM
+    """
+    conn = _connect()
+    conn.execute(
+        "INSERT OR REPLACE INTO classifications (key, category) VALUES (?, ?)", (key, category)
+    )
+    conn.commit()
@@ -3,14 +3,20 @@
 Uses an LLM to classify messy doc_type values into standardized categories.
 """
 
+import asyncio
+import functools
 import json
 import logging
+import math
 import random
+import re
+import time
 from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
-from utils import setup_logging, stream_jsonl
+import llm_cache
+from utils import setup_logging, stream_jsonl, json_loads, write_json
 
 
 STANDARD_CATEGORIES = [
@@ -26,7 +32,7 @@ STANDARD_CATEGORIES = [
 ]
 
 
-def sample_doc_types_strategically(jsonl_path: str, sample_size: int = 200) -> List[str]:
+def sample_doc_types_strategically(doc_type_counter: Counter, sample_size: int = 200) -> List[str]:
     """
     Sample doc_type values strategically from the dataset.
     
@@ -36,7 +42,7 @@ def sample_doc_types_strategically(jsonl_path: str, sample_size: int = 200) -> L
     3. Ensure we get rare types too (at least one of each)
     
     Args:
-        jsonl_path: Path to JSONL file
+        doc_type_counter: Counter of doc_type frequencies across the dataset
         sample_size: Number of doc_types to sample
         
     Returns:
@@ -45,19 +51,6 @@ def sample_doc_types_strategically(jsonl_path: str, sample_size: int = 200) -> L
     setup_logging()
     logger = logging.getLogger(__name__)
     
-    doc_type_counter = Counter()
-    total_records = 0
-    
-    logger.info(f"Analyzing doc_types in {jsonl_path}")
-    
-    for record in stream_jsonl(jsonl_path):
-        total_records += 1
-        doc_type = record.get('doc_type')
-        if doc_type:
-            doc_type_counter[doc_type] += 1
-    
-    logger.info(f"Found {len(doc_type_counter)} unique doc_types in {total_records} records")
-    
     unique_doc_types = list(doc_type_counter.keys())
     
     if len(unique_doc_types) <= sample_size:
@@ -83,13 +76,197 @@ def sample_doc_types_strategically(jsonl_path: str, sample_size: int = 200) -> L
     return sampled
 
 
-def classify_with_llm(doc_types: List[str], api_key: Optional[str] = None) -> Dict[str, str]:
+CLASSIFICATION_MODEL = "gpt-4o-mini"
+
+# Shared instructions live in a fixed system message so every request starts
+# with an identical prefix (eligible for OpenAI's automatic prompt caching);
+# user messages carry only the numbered doc_type list.
+SYSTEM_MESSAGE = f"""You are a data classification expert. Classify each document type from property records listed by the user into one of these standardized categories:
+
+Categories: {", ".join(STANDARD_CATEGORIES)}
+
+Answer every document type on its own line as "<number>. <CATEGORY>", using the number it has in the user's list, with nothing else (e.g. "1. MORTGAGE")."""
+
+BATCH_SIZE = 128
+
+# Completion budget per answer line such as "128. DEED_OF_TRUST\n": up to 4
+# tokens of numbering, about one token per 3 characters of the longest
+# category name, and the newline, plus 50% headroom. Unused tokens are not
+# billed, so the margin costs nothing.
+_LONGEST_CATEGORY = max(len(category) for category in STANDARD_CATEGORIES)
+MAX_TOKENS_PER_DOC_TYPE = math.ceil((4 + math.ceil(_LONGEST_CATEGORY / 3) + 1) * 1.5)
+
+# Extra completion budget per request, for any text around the list
+MAX_TOKENS_OVERHEAD = 32
+
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)[.)]\s*(\w+)')
+
+# Self-consistency mode: sample several completions per batch (input tokens
+# are billed once) and majority-vote the category for each doc_type
+SELF_CONSISTENCY_SAMPLES = 3
+SELF_CONSISTENCY_TEMPERATURE = 0.3
+
+# Cost per 1K tokens for CLASSIFICATION_MODEL (Batch API is billed at half)
+COST_PER_1K_TOKENS = 0.00015
+
+
+def _build_request_body(batch: List[str], self_consistency: bool = False) -> Dict[str, Any]:
+    """
+    Build the chat completion request body for a batch of doc_types.
+    
+    Args:
+        batch: List of doc_type values to classify
+        self_consistency: Whether to request several completions for voting
+        
+    Returns:
+        Keyword arguments for chat.completions.create
+    """
+    body = {
+        "model": CLASSIFICATION_MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_MESSAGE},
+            {"role": "user", "content": "\n".join([f"{j+1}. {dt}" for j, dt in enumerate(batch)])}
+        ],
+        "temperature": 0.1,
+        "max_tokens": len(batch) * MAX_TOKENS_PER_DOC_TYPE + MAX_TOKENS_OVERHEAD
+    }
+    if self_consistency:
+        body["n"] = SELF_CONSISTENCY_SAMPLES
+        body["temperature"] = SELF_CONSISTENCY_TEMPERATURE
+    return body
+
+
+def _parse_batch_response(batch: List[str], content: str) -> Dict[str, str]:
+    """
+    Map an LLM response ("<number>. <CATEGORY>" per line) back onto its batch.
+    
+    Args:
+        batch: List of doc_type values that were sent
+        content: Raw response text
+        
+    Returns:
+        Dictionary mapping each doc_type that got a valid category to that
+        category (doc_types with a missing or unknown answer are left out)
+    """
+    batch_mapping = {}
+    lines = [line for line in content.strip().split('\n') if line.strip()]
+    
+    # Answers are matched by their number, so a skipped line doesn't shift
+    # every following category onto the wrong doc_type
+    numbered = {}
+    for line in lines:
+        match = _NUMBERED_LINE_RE.match(line)
+        if match:
+            numbered[int(match.group(1))] = match.group(2)
+    
+    if numbered:
+        answers = [numbered.get(j + 1, "") for j in range(len(batch))]
+    elif len(lines) == len(batch):
+        answers = lines
+    else:
+        # Unnumbered with a line skipped or merged: positions can't be trusted
+        answers = []
+    
+    for doc_type, answer in zip(batch, answers):
+        category = answer.strip().upper()
+        if category in STANDARD_CATEGORIES:
+            batch_mapping[doc_type] = category
+    
+    return batch_mapping
+
+
+def _vote_batch_responses(batch: List[str], contents: List[str]) -> Dict[str, str]:
+    """
+    Majority-vote the categories from one or more completions of a batch.
+    
+    Only valid answers vote; ties go to the answer from the earliest completion.
+    
+    Args:
+        batch: List of doc_type values that were sent
+        contents: Raw response text of each completion
+        
+    Returns:
+        Dictionary mapping each doc_type with at least one valid answer to a category
+    """
+    votes = [_parse_batch_response(batch, content) for content in contents]
+    if len(votes) == 1:
+        return votes[0]
+    batch_mapping = {}
+    for doc_type in batch:
+        answers = [vote[doc_type] for vote in votes if doc_type in vote]
+        if answers:
+            batch_mapping[doc_type] = Counter(answers).most_common(1)[0][0]
+    return batch_mapping
+
+
+def _resolve_api_key(api_key: Optional[str]) -> Optional[str]:
+    """Return the given API key, or fall back to the OPENAI_API_KEY env var."""
+    if not api_key:
+        import os
+        api_key = os.getenv('OPENAI_API_KEY')
+    return api_key
+
+
+def _split_cached(doc_types: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Split doc_types into cached classifications and cache misses.
+    
+    Args:
+        doc_types: List of doc_type values to classify
+        
+    Returns:
+        Tuple of (mapping served from the cache, doc_types still to classify)
+    """
+    cached = {}
+    misses = []
+    for doc_type in doc_types:
+        category = llm_cache.get(llm_cache.make_key(CLASSIFICATION_MODEL, doc_type))
+        if category:
+            cached[doc_type] = category
+        else:
+            misses.append(doc_type)
+    return cached, misses
+
+
+def _store_cached(mapping: Dict[str, str]):
+    """Persist validated LLM classifications to the cache (never fallback guesses)."""
+    for doc_type, category in mapping.items():
+        llm_cache.set(llm_cache.make_key(CLASSIFICATION_MODEL, doc_type), category)
+
+
+def classify_with_llm(doc_types: List[str], api_key: Optional[str] = None, concurrency: int = 8,
+                      self_consistency: bool = False) -> Dict[str, str]:
+    """
+    Use LLM to classify doc_type values into standardized categories.
+    
+    Synchronous wrapper around classify_with_llm_async.
+    
+    Args:
+        doc_types: List of doc_type values to classify
+        api_key: Optional OpenAI API key (if None, uses environment variable)
+        concurrency: Maximum number of batches in flight at once
+        self_consistency: Whether to majority-vote over several completions per batch
+        
+    Returns:
+        Dictionary mapping original doc_type to standardized category
+    """
+    return asyncio.run(classify_with_llm_async(doc_types, api_key, concurrency=concurrency,
+                                               self_consistency=self_consistency))
+
+
+async def classify_with_llm_async(doc_types: List[str], api_key: Optional[str] = None,
+                                  concurrency: int = 8, self_consistency: bool = False) -> Dict[str, str]:
     """
     Use LLM to classify doc_type values into standardized categories.
     
+    Batches are sent concurrently through a single AsyncOpenAI client (so the
+    connection pool is shared), with at most `concurrency` requests in flight.
+    
     Args:
         doc_types: List of doc_type values to classify
         api_key: Optional OpenAI API key (if None, uses environment variable)
+        concurrency: Maximum number of batches in flight at once
+        self_consistency: Whether to majority-vote over several completions per batch
         
     Returns:
         Dictionary mapping original doc_type to standardized category
@@ -103,149 +280,231 @@ def classify_with_llm(doc_types: List[str], api_key: Optional[str] = None) -> Di
         logger.error("openai package not installed. Install with: pip install openai")
         raise
     
-    if not api_key:
-        import os
-        api_key = os.getenv('OPENAI_API_KEY')
+    api_key = _resolve_api_key(api_key)
     
     if not api_key:
         logger.warning("No OpenAI API key provided. Using fallback classification.")
         return fallback_classification(doc_types)
     
-    client = openai.OpenAI(api_key=api_key)
-    
-    mapping = {}
+    mapping, misses = _split_cached(doc_types)
+    logger.info(f"{len(mapping)} doc_types served from cache, {len(misses)} to classify")
     
-    categories_description = ", ".join(STANDARD_CATEGORIES)
+    if not misses:
+        return mapping
     
-    prompt = f"""You are a data classification expert. Classify the following document types from property records into one of these standardized categories:
-
-Categories: {categories_description}
-
-Rules:
-- SALE_DEED: Any type of deed (Warranty Deed, Quitclaim Deed, General Warranty Deed, etc.)
-- MORTGAGE: Mortgage documents, mortgage assignments, mortgage modifications
-- DEED_OF_TRUST: Deed of Trust, Trust Deed, D/T, DT, D-TR
-- RELEASE: Release, Partial Release, Release of Lien, Satisfaction, Cancellation
-- LIEN: Lien, Mechanic's Lien, Tax Lien, Judgment Lien
-- PLAT: Plat, Map, Map Plat, Subdivision Plat
-- EASEMENT: Easement, Right of Way
-- LEASE: Lease, Lease Agreement
-- MISC: Everything else that doesn't fit the above categories
-
-For each document type, respond with ONLY the category name, nothing else.
-
-Document types to classify:
-"""
+    client = openai.AsyncOpenAI(api_key=api_key)
+    semaphore = asyncio.Semaphore(concurrency)
     
-    batch_size = 50
-    total_cost = 0
+    batches = [misses[i:i+BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
     
-    for i in range(0, len(doc_types), batch_size):
-        batch = doc_types[i:i+batch_size]
-        batch_prompt = prompt + "\n".join([f"{j+1}. {dt}" for j, dt in enumerate(batch)])
+    async def _classify_batch(batch: List[str]) -> Tuple[Dict[str, str], float]:
+        async with semaphore:
+            response = await client.chat.completions.create(**_build_request_body(batch, self_consistency))
+        
+        batch_mapping = _vote_batch_responses(batch, [choice.message.content for choice in response.choices])
+        _store_cached(batch_mapping)
+        cost = (response.usage.total_tokens / 1000) * COST_PER_1K_TOKENS
+        
+        unanswered = [dt for dt in batch if dt not in batch_mapping]
+        if not unanswered:
+            return batch_mapping, cost
         
+        if len(batch) > 1 and any(choice.finish_reason == "length" for choice in response.choices):
+            # Cut off by max_tokens: ask again for the rest in two smaller requests
+            logger.warning(f"Response truncated with {len(unanswered)} doc_types unanswered. Retrying them.")
+            half = (len(unanswered) + 1) // 2
+            parts = [unanswered[:half], unanswered[half:]]
+            for part_mapping, part_cost in await asyncio.gather(*[_classify_batch(part) for part in parts if part]):
+                batch_mapping.update(part_mapping)
+                cost += part_cost
+        else:
+            # Left out of the cache so the next run asks the LLM again
+            logger.warning(f"{len(unanswered)} doc_types got no valid category. Using fallback for them.")
+            batch_mapping.update(fallback_classification(unanswered))
+        
+        return batch_mapping, cost
+    
+    async def _one_batch(batch_num: int, batch: List[str]):
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a precise classification assistant. Respond with only category names, one per line."},
-                    {"role": "user", "content": batch_prompt}
-                ],
-                temperature=0.1,
-                max_tokens=500
-            )
-            
-            result = response.choices[0].message.content.strip()
-            lines = result.split('\n')
-            
-            for j, doc_type in enumerate(batch):
-                if j < len(lines):
-                    category = lines[j].strip().upper()
-                    if category in STANDARD_CATEGORIES:
-                        mapping[doc_type] = category
-                    else:
-                        mapping[doc_type] = "MISC"
-                else:
-                    mapping[doc_type] = "MISC"
-            
-            tokens_used = response.usage.total_tokens
-            cost = (tokens_used / 1000) * 0.00015
-            total_cost += cost
-            
-            logger.info(f"Classified batch {i//batch_size + 1} ({len(batch)} doc_types). Cost: ${cost:.4f}")
+            batch_mapping, cost = await _classify_batch(batch)
+            logger.info(f"Classified batch {batch_num} ({len(batch)} doc_types). Cost: ${cost:.4f}")
+            return batch_mapping, cost
             
         except Exception as e:
             logger.error(f"Error classifying batch: {e}")
-            for doc_type in batch:
-                mapping[doc_type] = fallback_classification([doc_type])[doc_type]
+            return fallback_classification(batch), 0
+    
+    results = await asyncio.gather(*[_one_batch(n, batch) for n, batch in enumerate(batches, 1)])
+    
+    total_cost = 0
+    for batch_mapping, cost in results:
+        mapping.update(batch_mapping)
+        total_cost += cost
     
     logger.info(f"Total classification cost: ${total_cost:.4f}")
     return mapping
 
 
-def fallback_classification(doc_types: List[str]) -> Dict[str, str]:
+def classify_with_batch_api(doc_types: List[str], api_key: Optional[str] = None,
+                            poll_interval: float = 30.0, self_consistency: bool = False) -> Dict[str, str]:
     """
-    Fallback classification using rule-based approach when LLM is not available.
+    Classify doc_type values through the OpenAI Batch API.
+    
+    All batches are uploaded as a single JSONL file and processed offline
+    (24h completion window) at half the synchronous API price. Blocks,
+    polling the batch status, until the job finishes.
     
     Args:
         doc_types: List of doc_type values to classify
+        api_key: Optional OpenAI API key (if None, uses environment variable)
+        poll_interval: Seconds to wait between batch status checks
+        self_consistency: Whether to majority-vote over several completions per batch
         
     Returns:
         Dictionary mapping original doc_type to standardized category
     """
-    mapping = {}
+    setup_logging()
+    logger = logging.getLogger(__name__)
     
-    for doc_type in doc_types:
-        dt_lower = doc_type.lower().strip()
-        dt_original = doc_type.strip()
-        
-        if dt_lower in ['dt', 'd/t', 'd-t', 'd-tr', 'd-trust', 'sub tr', 'subst tr', 'substitution trustee']:
-            mapping[doc_type] = "DEED_OF_TRUST"
-        elif 'trust' in dt_lower and ('deed' in dt_lower or dt_lower.startswith('trust')):
-            mapping[doc_type] = "DEED_OF_TRUST"
-        elif any(keyword in dt_lower for keyword in ['mortgage', 'mtge', 'mtg', 'morg']):
-            mapping[doc_type] = "MORTGAGE"
-        elif any(keyword in dt_lower for keyword in ['satisfaction', 'sat', 'certificate of satisfaction']):
-            mapping[doc_type] = "RELEASE"
-        elif any(keyword in dt_lower for keyword in ['cancellation', 'can', 'cancel']):
-            mapping[doc_type] = "RELEASE"
-        elif any(keyword in dt_lower for keyword in ['release', 'rel', 'partial release', 'rel deed']):
-            mapping[doc_type] = "RELEASE"
-        elif 'lien' in dt_lower or dt_lower in ['judgment', 'judgement']:
-            mapping[doc_type] = "LIEN"
-        elif any(keyword in dt_lower for keyword in ['plat', 'map plat', 'map/r', 'map', 'subdivision plat']):
-            mapping[doc_type] = "PLAT"
-        elif 'lease' in dt_lower:
-            mapping[doc_type] = "LEASE"
-        elif any(keyword in dt_lower for keyword in ['substitute trustee', 'substitution trustee', 'sub tr', 'subst tr']):
-            mapping[doc_type] = "DEED_OF_TRUST"
-        elif 'easement' in dt_lower or 'right of way' in dt_lower:
-            mapping[doc_type] = "EASEMENT"
-        elif any(keyword in dt_lower for keyword in ['deed', 'warranty', 'quitclaim', 'grant', 'conveyance']):
-            if 'trust' in dt_lower or 'trustee' in dt_lower:
-                mapping[doc_type] = "DEED_OF_TRUST"
-            elif 'easement' in dt_lower:
-                mapping[doc_type] = "EASEMENT"
-            else:
-                mapping[doc_type] = "SALE_DEED"
-        elif any(keyword in dt_lower for keyword in ['assignment', 'asign', 'assign']):
-            if 'mortgage' in dt_lower or 'mtg' in dt_lower:
-                mapping[doc_type] = "MORTGAGE"
-            elif 'trust' in dt_lower or 'trustee' in dt_lower:
-                mapping[doc_type] = "DEED_OF_TRUST"
-            else:
-                mapping[doc_type] = "MISC"
-        elif any(keyword in dt_lower for keyword in ['power of attorney', 'poa']):
-            mapping[doc_type] = "MISC"
-        elif any(keyword in dt_lower for keyword in ['notice', 'request notice', 'see instrument']):
-            mapping[doc_type] = "MISC"
-        else:
-            mapping[doc_type] = "MISC"
+    try:
+        import openai
+    except ImportError:
+        logger.error("openai package not installed. Install with: pip install openai")
+        raise
+    
+    api_key = _resolve_api_key(api_key)
+    
+    if not api_key:
+        logger.warning("No OpenAI API key provided. Using fallback classification.")
+        return fallback_classification(doc_types)
+    
+    mapping, misses = _split_cached(doc_types)
+    logger.info(f"{len(mapping)} doc_types served from cache, {len(misses)} to classify")
+    
+    if not misses:
+        return mapping
+    
+    client = openai.OpenAI(api_key=api_key)
+    
+    batches = [misses[i:i+BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
+    
+    request_lines = []
+    for i, batch in enumerate(batches):
+        request_lines.append(json.dumps({
+            "custom_id": f"dt-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _build_request_body(batch, self_consistency)
+        }, ensure_ascii=False))
+    
+    input_file = client.files.create(
+        file=("doc_type_batch.jsonl", "\n".join(request_lines).encode('utf-8')),
+        purpose="batch"
+    )
+    batch_job = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info(f"Submitted batch job {batch_job.id} ({len(batches)} requests)")
+    
+    while batch_job.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch_job = client.batches.retrieve(batch_job.id)
+        logger.debug(f"Batch job {batch_job.id} status: {batch_job.status}")
+    
+    if batch_job.status != "completed" or not batch_job.output_file_id:
+        logger.error(f"Batch job {batch_job.id} ended with status '{batch_job.status}'. Using fallback.")
+        mapping.update(fallback_classification(misses))
+        return mapping
+    
+    output = client.files.content(batch_job.output_file_id).text
+    
+    total_cost = 0
+    
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = json_loads(line)
+            batch = batches[int(item["custom_id"].split('-', 1)[1])]
+            body = (item.get("response") or {}).get("body") or {}
+            if not body.get("choices"):
+                logger.error(f"Request {item['custom_id']} failed: {item.get('error')}")
+                continue
+            if any(choice.get("finish_reason") == "length" for choice in body["choices"]):
+                logger.warning(f"Request {item['custom_id']} was truncated by max_tokens")
+            batch_mapping = _vote_batch_responses(batch, [choice["message"]["content"] for choice in body["choices"]])
+            _store_cached(batch_mapping)
+            mapping.update(batch_mapping)
+            total_cost += (body["usage"]["total_tokens"] / 1000) * COST_PER_1K_TOKENS / 2
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error(f"Error parsing batch output line: {e}")
+    
+    missing = [dt for dt in misses if dt not in mapping]
+    if missing:
+        # Not cached, so the next run sends them to the LLM again
+        logger.warning(f"{len(missing)} doc_types missing from batch output. Using fallback for them.")
+        mapping.update(fallback_classification(missing))
     
+    logger.info(f"Total classification cost: ${total_cost:.4f}")
     return mapping
 
 
-def create_mapping(jsonl_path: str, output_path: str, use_llm: bool = True, api_key: Optional[str] = None):
+# Rule-based fallback: (category, pattern) pairs checked in priority order
+# against the lower-cased doc_type; the first pattern that matches wins.
+# Keywords are plain substrings (e.g. "sat" also matches "satisfaction").
+CATEGORY_PATTERNS = [
+    ("DEED_OF_TRUST", re.compile(r"\A(?:dt|d/t|d-t|d-tr|d-trust|sub tr|subst tr|substitution trustee)\Z")),
+    ("DEED_OF_TRUST", re.compile(r"\Atrust|\A(?=.*trust).*deed", re.DOTALL)),
+    ("MORTGAGE", re.compile(r"mortgage|mtge|mtg|morg")),
+    ("RELEASE", re.compile(r"satisfaction|sat|cancellation|cancel|can|release|rel")),
+    ("LIEN", re.compile(r"lien|\Ajudge?ment\Z")),
+    ("PLAT", re.compile(r"subdivision plat|map plat|map/r|plat|map")),
+    ("LEASE", re.compile(r"lease")),
+    ("DEED_OF_TRUST", re.compile(r"substitute trustee|substitution trustee|sub tr|subst tr")),
+    ("EASEMENT", re.compile(r"easement|right of way")),
+    ("DEED_OF_TRUST", re.compile(r"\A(?=.*(?:deed|warranty|quitclaim|grant|conveyance)).*trust", re.DOTALL)),
+    ("SALE_DEED", re.compile(r"deed|warranty|quitclaim|grant|conveyance")),
+    ("DEED_OF_TRUST", re.compile(r"\A(?=.*(?:assignment|asign|assign)).*trust", re.DOTALL)),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _classify_doc_type(doc_type: str) -> str:
+    """
+    Classify a single doc_type with the rule-based CATEGORY_PATTERNS.
+    
+    Args:
+        doc_type: Original doc_type value
+        
+    Returns:
+        Standardized category ("MISC" if no rule matches)
+    """
+    dt_lower = doc_type.lower().strip()
+    
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(dt_lower):
+            return category
+    
+    return "MISC"
+
+
+def fallback_classification(doc_types: List[str]) -> Dict[str, str]:
+    """
+    Fallback classification using rule-based approach when LLM is not available.
+    
+    Args:
+        doc_types: List of doc_type values to classify
+        
+    Returns:
+        Dictionary mapping original doc_type to standardized category
+    """
+    return {doc_type: _classify_doc_type(doc_type) for doc_type in doc_types}
+
+
+def create_mapping(jsonl_path: str, output_path: str, use_llm: bool = True, api_key: Optional[str] = None,
+                   use_batch_api: bool = False, self_consistency: bool = False):
     """
     Create doc_type mapping using LLM classification.
     
@@ -254,18 +513,38 @@ def create_mapping(jsonl_path: str, output_path: str, use_llm: bool = True, api_
         output_path: Path to output mapping JSON file
         use_llm: Whether to use LLM (if False, uses fallback)
         api_key: Optional OpenAI API key
+        use_batch_api: Whether to classify through the (cheaper, offline) Batch API
+        self_consistency: Whether to majority-vote over several LLM completions per batch
     """
     setup_logging()
     logger = logging.getLogger(__name__)
     
     logger.info("Starting doc_type classification")
     
-    sampled_doc_types = sample_doc_types_strategically(jsonl_path, sample_size=200)
+    doc_type_counter = Counter()
+    total_records = 0
+    
+    logger.info(f"Analyzing doc_types in {jsonl_path}")
+    
+    for record in stream_jsonl(jsonl_path):
+        total_records += 1
+        doc_type = record.get('doc_type')
+        if doc_type:
+            doc_type_counter[doc_type] += 1
+    
+    logger.info(f"Found {len(doc_type_counter)} unique doc_types in {total_records} records")
+    
+    sampled_doc_types = sample_doc_types_strategically(doc_type_counter, sample_size=200)
     
     if use_llm:
         logger.info("Using LLM for classification")
         try:
-            mapping = classify_with_llm(sampled_doc_types, api_key)
+            if use_batch_api:
+                mapping = classify_with_batch_api(sampled_doc_types, api_key,
+                                                  self_consistency=self_consistency)
+            else:
+                mapping = asyncio.run(classify_with_llm_async(sampled_doc_types, api_key,
+                                                              self_consistency=self_consistency))
         except Exception as e:
             logger.warning(f"LLM classification failed: {e}. Using fallback.")
             mapping = fallback_classification(sampled_doc_types)
@@ -273,24 +552,19 @@ def create_mapping(jsonl_path: str, output_path: str, use_llm: bool = True, api_
         logger.info("Using rule-based fallback classification")
         mapping = fallback_classification(sampled_doc_types)
     
-    doc_type_counter = Counter()
-    for record in stream_jsonl(jsonl_path):
-        doc_type = record.get('doc_type')
-        if doc_type:
-            doc_type_counter[doc_type] += 1
+    fallback_mapping = fallback_classification([dt for dt in doc_type_counter if dt not in mapping])
     
     complete_mapping = {}
     for doc_type in doc_type_counter.keys():
         if doc_type in mapping:
             complete_mapping[doc_type] = mapping[doc_type]
         else:
-            complete_mapping[doc_type] = fallback_classification([doc_type])[doc_type]
+            complete_mapping[doc_type] = fallback_mapping[doc_type]
     
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(complete_mapping, f, indent=2, ensure_ascii=False)
+    write_json(complete_mapping, output_path)
     
     logger.info(f"Mapping complete. {len(complete_mapping)} doc_types classified.")
     logger.info(f"Output saved to {output_path}")
@@ -312,7 +586,12 @@ if __name__ == "__main__":
     parser.add_argument("--no-llm", action="store_true",
                        help="Use rule-based classification instead of LLM")
     parser.add_argument("--api-key", help="OpenAI API key (or set OPENAI_API_KEY env var)")
+    parser.add_argument("--batch-api", action="store_true",
+                       help="Use the OpenAI Batch API (50%% cheaper, results within 24h)")
+    parser.add_argument("--self-consistency", action="store_true",
+                       help=f"Sample {SELF_CONSISTENCY_SAMPLES} completions per batch and majority-vote each category")
     
     args = parser.parse_args()
     
-    create_mapping(args.input, args.output, use_llm=not args.no_llm, api_key=args.api_key)
+    create_mapping(args.input, args.output, use_llm=not args.no_llm, api_key=args.api_key,
+                   use_batch_api=args.batch_api, self_consistency=args.self_consistency)
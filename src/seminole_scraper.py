@@ -3,16 +3,156 @@
 Scrapes property records from Seminole County's official records website.
 """
 
+import asyncio
+import functools
+import itertools
 import json
+import re
 import time
 import logging
-from typing import List, Dict, Any, Optional
+import urllib.parse
+from datetime import datetime
+from typing import Iterable, List, Dict, Any, Optional, Union
 from pathlib import Path
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.etree
+import lxml.html
 
-from utils import setup_logging, normalize_name, parse_date
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+from utils import setup_logging, normalize_name, normalize_names, parse_date, json_loads, write_json
+
+
+# On-disk HTTP cache for search responses (used when requests-cache is installed)
+HTTP_CACHE_PATH = Path(__file__).resolve().parent.parent / "outputs" / ".seminole_cache.sqlite"
+HTTP_CACHE_EXPIRE_SECONDS = 3600
+
+# Bytes read from the socket per parser feed when streaming HTML results
+HTML_CHUNK_SIZE = 64 * 1024
+
+# Skipped when sniffing whether a response body is JSON (whitespace, UTF-8 BOM)
+_LEADING_NOISE = b' \t\r\n\xef\xbb\xbf'
+
+
+def _xpath_lower(expr: str) -> str:
+    """Wrap an XPath expression in an ASCII lower-casing translate() (XPath 1.0 has no lower-case())."""
+    return f"translate({expr}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+
+# One HTML parser configuration for every page. Comments and processing
+# instructions are dropped while parsing, so they never become tree nodes.
+_HTML_PARSER_OPTIONS = dict(recover=True, remove_comments=True, remove_pis=True)
+_HTML_PARSER = lxml.html.HTMLParser(**_HTML_PARSER_OPTIONS)
+
+# Compiled once at import; XPath evaluation runs in C instead of walking the
+# tree node by node in Python
+_CELL_XPATH = lxml.etree.XPath(".//td|.//th")
+_TABLE_DIV_XPATH = lxml.etree.XPath(f"//div[contains({_xpath_lower('@class')}, 'table')]")
+_NO_RESULTS_XPATH = lxml.etree.XPath(
+    f"//text()[contains({_xpath_lower('.')}, 'no results') or contains({_xpath_lower('.')}, 'no records')]"
+)
+_NAME_FIELD_XPATH = lxml.etree.XPath(
+    f"//*[self::input or self::select][contains({_xpath_lower('@name')}, 'name')"
+    f" or contains({_xpath_lower('@name')}, 'party') or contains({_xpath_lower('@name')}, 'search')]"
+)
+_NAMED_FIELD_XPATH = lxml.etree.XPath("//*[self::input or self::select][@name = $name]")
+_HIDDEN_INPUT_XPATH = lxml.etree.XPath("//input[@type = 'hidden']")
+_NEXT_LINK_XPATH = lxml.etree.XPath(f"//a[contains({_xpath_lower('.')}, 'next')]")
+_NEXT_OR_ARROW_LINK_XPATH = lxml.etree.XPath(f"//a[contains({_xpath_lower('.')}, 'next') or contains(., '>')]")
+_PAGE_LINK_XPATH = lxml.etree.XPath(
+    f"//a[contains({_xpath_lower('@href')}, 'page') or contains({_xpath_lower('@href')}, 'p=')]"
+)
+_PAGINATION_NEXT_LINK_XPATH = lxml.etree.XPath(
+    f"//*[self::div or self::span][contains({_xpath_lower('@class')}, 'pagination')]"
+    f"//a[contains({_xpath_lower('.')}, 'next')]"
+)
+
+# Consideration cell, e.g. "$250,000.00" or "1,234"
+_MONEY_RE = re.compile(r'\$?\s*(\d[\d,]*(?:\.\d*)?|\.\d+)', re.ASCII)
+
+# Keyword -> doc_category, checked in order (first hit wins); shared by the
+# results-table and API record parsers
+_DOC_CATEGORIES = {
+    'deed': 'deed',
+    'mortgage': 'mortgage',
+    'trust': 'trust',
+    'release': 'release',
+    'satisfaction': 'release',
+    'lien': 'lien',
+    'judgment': 'judgment',
+    'order': 'order',
+    'notice': 'notice',
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _doc_category(doc_type: str) -> str:
+    """
+    Map a document type to its doc_category by keyword.
+    
+    Args:
+        doc_type: Document type text from the results table or API
+        
+    Returns:
+        Category name, or "misc" if no keyword matches
+    """
+    doc_lower = doc_type.lower()
+    for keyword, category in _DOC_CATEGORIES.items():
+        if keyword in doc_lower:
+            return category
+    return "misc"
+
+
+def _parse_consideration(text: str) -> Optional[float]:
+    """
+    Parse a consideration amount from a results table cell.
+    
+    Args:
+        text: Stripped cell text, e.g. "$250,000.00" or "1,234"
+        
+    Returns:
+        Amount as a float, or None if the cell is not a money value
+    """
+    money = _MONEY_RE.fullmatch(text)
+    if money and ('$' in text or len(text) > 3):
+        return float(money.group(1).replace(',', ''))
+    return None
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared by concurrent asyncio tasks."""
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Initialize the limiter.
+        
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
 
 class SeminoleScraper:
@@ -26,134 +166,282 @@ class SeminoleScraper:
         "https://recording.seminoleclerk.org/DuProcessWebInquiry/Search.aspx",
     ]
     
-    def __init__(self, delay: float = 1.0):
+    # Accept-Encoding is left to requests' session default, which adds br/zstd
+    # when a decoder (brotli, zstandard) is installed
+    _DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Connection': 'keep-alive',
+    }
+    
+    # CriteriaSearch fields; only full_name and file_date_end vary per search
+    _BASE_CRITERIA = {
+        "direction": "",
+        "name_direction": True,
+        "full_name": "",
+        "file_date_start": "1/1/1913",
+        "file_date_end": "",
+        "inst_type": "",
+        "inst_book_type_id": "",
+        "location_id": "",
+        "book_reel": "",
+        "page_image": "",
+        "greater_than_page": False,
+        "inst_num": "",
+        "description": "",
+        "consideration_value_min": "",
+        "consideration_value_max": "",
+        "parcel_id": "",
+        "legal_section": "",
+        "legal_township": "",
+        "legal_range": "",
+        "legal_square": "",
+        "subdivision_code": "",
+        "block": "",
+        "lot_from": "",
+        "q_NWNW": False,
+        "q_NWNE": False,
+        "q_NWSE": False,
+        "q_NWSW": False,
+        "q_NENW": False,
+        "q_NENE": False,
+        "q_NESW": False,
+        "q_NESE": False,
+        "q_SWNW": False,
+        "q_SWNE": False,
+        "q_SWSW": False,
+        "q_SWSE": False,
+        "q_SENW": False,
+        "q_SENE": False,
+        "q_SESW": False,
+        "q_SESE": False,
+        "q_q_search_type": False,
+        "address_street": "",
+        "address_number": "",
+        "address_parcel": "",
+        "address_ppin": "",
+        "patent_number": ""
+    }
+    
+    # _BASE_CRITERIA serialized and URL-encoded once, with placeholders for the
+    # two per-search fields (neither placeholder is changed by quote())
+    _CRITERIA_TEMPLATE = urllib.parse.quote(json.dumps([
+        {**_BASE_CRITERIA, "full_name": "__NAME__", "file_date_end": "__END__"}
+    ]))
+    
+    def __init__(self, delay: float = 1.0, max_retries: int = 3, use_cache: bool = True):
         """
         Initialize the scraper.
         
         Args:
             delay: Delay in seconds between requests
+            max_retries: Maximum number of retry attempts for failed requests
+            use_cache: Whether to cache responses on disk (requires requests-cache)
         """
         self.delay = delay
-        self.session = requests.Session()
+        if use_cache and requests_cache is not None:
+            # Responses are reused for an hour, then revalidated with
+            # If-None-Match / If-Modified-Since so a 304 skips the download
+            HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            self.session = requests_cache.CachedSession(
+                str(HTTP_CACHE_PATH),
+                backend='sqlite',
+                expire_after=HTTP_CACHE_EXPIRE_SECONDS,
+                cache_control=True
+            )
+        else:
+            self.session = requests.Session()
+        # Pooled keep-alive connections; transient errors are retried with
+        # backoff on the same connection pool instead of a manual sleep loop
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=max_retries, backoff_factor=0.5,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.logger = logging.getLogger(__name__)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+        self.session.headers.update(self._DEFAULT_HEADERS)
         
-    def search_by_name(self, name: str, max_retries: int = 3) -> List[Dict[str, Any]]:
+    def search_by_name(self, name: str) -> List[Dict[str, Any]]:
         """
         Search for records by person/entity name using the API endpoint.
         
         Args:
             name: Name to search for
-            max_retries: Maximum number of retry attempts for failed requests
             
         Returns:
             List of record dictionaries
         """
         self.logger.info(f"Searching for name: {name}")
         
-        for attempt in range(max_retries):
-            try:
-                from datetime import datetime
-                import urllib.parse
-                
-                today = datetime.now().strftime("%m/%d/%Y")
-                
-                criteria = {
-                    "direction": "",
-                    "name_direction": True,
-                    "full_name": name.upper(),
-                    "file_date_start": "1/1/1913",
-                    "file_date_end": today,
-                    "inst_type": "",
-                    "inst_book_type_id": "",
-                    "location_id": "",
-                    "book_reel": "",
-                    "page_image": "",
-                    "greater_than_page": False,
-                    "inst_num": "",
-                    "description": "",
-                    "consideration_value_min": "",
-                    "consideration_value_max": "",
-                    "parcel_id": "",
-                    "legal_section": "",
-                    "legal_township": "",
-                    "legal_range": "",
-                    "legal_square": "",
-                    "subdivision_code": "",
-                    "block": "",
-                    "lot_from": "",
-                    "q_NWNW": False,
-                    "q_NWNE": False,
-                    "q_NWSE": False,
-                    "q_NWSW": False,
-                    "q_NENW": False,
-                    "q_NENE": False,
-                    "q_NESW": False,
-                    "q_NESE": False,
-                    "q_SWNW": False,
-                    "q_SWNE": False,
-                    "q_SWSW": False,
-                    "q_SWSE": False,
-                    "q_SENW": False,
-                    "q_SENE": False,
-                    "q_SESW": False,
-                    "q_SESE": False,
-                    "q_q_search_type": False,
-                    "address_street": "",
-                    "address_number": "",
-                    "address_parcel": "",
-                    "address_ppin": "",
-                    "patent_number": ""
-                }
-                
-                criteria_array = json.dumps([criteria])
-                encoded_criteria = urllib.parse.quote(criteria_array)
-                
-                api_url = f"{self.API_URL}?criteria_array={encoded_criteria}"
-                self.logger.debug(f"Calling API: {self.API_URL}")
-                
-                search_response = self._make_request('GET', api_url, timeout=120)
-                time.sleep(self.delay)
+        try:
+            api_url = self._build_api_url(name)
+            self.logger.debug(f"Calling API: {self.API_URL}")
+            
+            search_response = self._make_request('GET', api_url, timeout=120, stream=True)
+            
+            with search_response:
+                chunks = search_response.iter_content(chunk_size=HTML_CHUNK_SIZE)
+                head = b''
+                for chunk in chunks:
+                    head += chunk
+                    if head.lstrip(_LEADING_NOISE):
+                        break
                 
-                try:
-                    data = search_response.json()
-                    self.logger.debug("Received JSON response from API")
-                    records = self._parse_api_response(data)
-                except (ValueError, json.JSONDecodeError):
+                if head.lstrip(_LEADING_NOISE)[:1] in (b'[', b'{'):
+                    # Looks like JSON (whatever the Content-Type says): read it all
+                    records = self._parse_response_body(head + b''.join(chunks))
+                else:
+                    # Feed the (decoded) body to the parser as it downloads, so rows
+                    # are extracted while the rest of the page is still arriving
                     self.logger.debug("Response is HTML, parsing as HTML")
-                    results_soup = BeautifulSoup(search_response.content, 'html.parser')
-                    records = self._parse_results_table(results_soup)
-                
-                all_records = records.copy()
-                
-                self.logger.info(f"Found {len(all_records)} total records")
-                return all_records
-                
-            except requests.exceptions.Timeout as e:
-                self.logger.warning(f"Timeout error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt == max_retries - 1:
-                    raise
-                time.sleep(self.delay * 2)  
-                
-            except requests.exceptions.RequestException as e:
-                self.logger.warning(f"Network error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt == max_retries - 1:
-                    raise
-                time.sleep(self.delay * 2)
-                
-            except Exception as e:
-                self.logger.error(f"Error during search: {e}", exc_info=True)
-                if attempt == max_retries - 1:
-                    raise
-                time.sleep(self.delay)
+                    records = self._parse_results_table(itertools.chain((head,), chunks))
+            
+            # Pause only once the body is read, so the delay never idles an open stream
+            time.sleep(self.delay)
+            
+            self.logger.info(f"Found {len(records)} total records")
+            return records
+            
+        except requests.exceptions.RequestException as e:
+            # Transient failures were already retried by the session's adapter
+            self.logger.error(f"Network error during search: {e}")
+            raise
+        
+    def _build_api_url(self, name: str) -> str:
+        """
+        Build the CriteriaSearch URL for a name search.
         
-        return []  
+        Args:
+            name: Name to search for
+            
+        Returns:
+            API URL with the encoded search criteria
+        """
+        today = datetime.now().strftime("%m/%d/%Y")
+        
+        # JSON-escape (without the surrounding quotes) then URL-encode just the
+        # substituted values; quote() works per character, so this equals
+        # encoding the whole serialized criteria. The name goes in last so its
+        # text is never scanned for a placeholder.
+        encoded_criteria = self._CRITERIA_TEMPLATE.replace(
+            "__END__", urllib.parse.quote(today)
+        ).replace(
+            "__NAME__", urllib.parse.quote(json.dumps(name.upper())[1:-1])
+        )
+        
+        return f"{self.API_URL}?criteria_array={encoded_criteria}"
+    
+    def _parse_response_body(self, body: bytes) -> List[Dict[str, Any]]:
+        """
+        Parse a fully read search response (JSON from the API, or an HTML results page).
+        
+        JSON is tried first regardless of the Content-Type header, since the API
+        does not reliably label its responses.
+        
+        Args:
+            body: Raw response body
+            
+        Returns:
+            List of record dictionaries
+        """
+        try:
+            data = json_loads(body.lstrip(_LEADING_NOISE))
+        except (ValueError, json.JSONDecodeError):
+            self.logger.debug("Response is HTML, parsing as HTML")
+            return self._parse_results_table([body])
+        self.logger.debug("Received JSON response from API")
+        return self._parse_api_response(data)
+    
+    def search_many(self, names: List[str], concurrency: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search for records for several names concurrently.
+        
+        Synchronous wrapper around search_many_async.
+        
+        Args:
+            names: Names to search for
+            concurrency: Maximum number of searches in flight at once
+            
+        Returns:
+            Dictionary mapping each name to its list of record dictionaries
+        """
+        return asyncio.run(self.search_many_async(names, concurrency=concurrency))
+    
+    async def search_many_async(self, names: List[str], concurrency: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search for records for several names concurrently using aiohttp.
+        
+        Searches share one aiohttp session; at most `concurrency` are in flight
+        at once, and request starts are spaced by a token bucket refilled at one
+        request per `delay` seconds, so the server sees the same request rate as
+        the sequential scraper while round trips overlap.
+        
+        Args:
+            names: Names to search for
+            concurrency: Maximum number of searches in flight at once
+            
+        Returns:
+            Dictionary mapping each name to its list of record dictionaries
+            (empty for names whose search failed)
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            self.logger.error("aiohttp package not installed. Install with: pip install aiohttp")
+            raise
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = RateLimiter(1.0 / self.delay) if self.delay > 0 else None
+        
+        # aiohttp advertises the encodings its own decoders support
+        headers = {k: v for k, v in self.session.headers.items() if k.lower() != 'accept-encoding'}
+        
+        async with aiohttp.ClientSession(headers=headers,
+                                         timeout=aiohttp.ClientTimeout(total=120)) as session:
+            results = await asyncio.gather(*[
+                self.search_by_name_async(session, name, semaphore, limiter) for name in names
+            ])
+        
+        return dict(zip(names, results))
+    
+    async def search_by_name_async(self, session, name: str, semaphore: asyncio.Semaphore,
+                                   limiter: Optional["RateLimiter"] = None) -> List[Dict[str, Any]]:
+        """
+        Search for records by person/entity name over an aiohttp session.
+        
+        Args:
+            session: aiohttp.ClientSession to send the request with
+            name: Name to search for
+            semaphore: Semaphore bounding the number of searches in flight
+            limiter: Optional rate limiter to acquire before sending
+            
+        Returns:
+            List of record dictionaries (empty if the search failed)
+        """
+        import aiohttp
+        
+        self.logger.info(f"Searching for name: {name}")
+        api_url = self._build_api_url(name)
+        
+        try:
+            async with semaphore:
+                if limiter:
+                    await limiter.acquire()
+                async with session.get(api_url) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Network error during search for '{name}': {e}")
+            return []
+        
+        records = self._parse_response_body(body)
+        self.logger.info(f"Found {len(records)} total records for '{name}'")
+        return records
+    
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """
         Make HTTP request with error handling.
@@ -174,22 +462,20 @@ class SeminoleScraper:
         response.raise_for_status()
         return response
     
-    def _build_search_params(self, name: str, soup: BeautifulSoup) -> Dict[str, str]:
+    def _build_search_params(self, name: str, doc: lxml.html.HtmlElement) -> Dict[str, str]:
         """
         Build search parameters based on form structure.
         
         Args:
             name: Name to search for
-            soup: BeautifulSoup object of the search page
+            doc: Parsed (lxml) search page
             
         Returns:
             Dictionary of form parameters
         """
         params = {}
         
-        name_fields = soup.find_all(['input', 'select'], {
-            'name': lambda x: x and ('name' in x.lower() or 'party' in x.lower() or 'search' in x.lower())
-        })
+        name_fields = _NAME_FIELD_XPATH(doc)
         
         if name_fields:
           
@@ -198,11 +484,11 @@ class SeminoleScraper:
         else:
             common_names = ['name', 'searchName', 'partyName', 'grantor', 'grantee', 'party']
             for common_name in common_names:
-                if soup.find('input', {'name': common_name}) or soup.find('select', {'name': common_name}):
+                if _NAMED_FIELD_XPATH(doc, name=common_name):
                     params[common_name] = name
                     break
         
-        hidden_inputs = soup.find_all('input', {'type': 'hidden'})
+        hidden_inputs = _HIDDEN_INPUT_XPATH(doc)
         for hidden in hidden_inputs:
             hidden_name = hidden.get('name')
             hidden_value = hidden.get('value', '')
@@ -215,69 +501,129 @@ class SeminoleScraper:
         
         return params
     
-    def _parse_results_table(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_results_table(self, chunks: Iterable[bytes]) -> List[Dict[str, Any]]:
         """
         Parse the results table from the HTML.
         
+        The page is fed to an lxml pull parser chunk by chunk: each row is
+        extracted as soon as its closing tag has been parsed and then freed, so
+        the full document tree is never held in memory. Only rows inside a
+        table count, and for a table with a <tbody> only the rows of its tbody.
+        
         Args:
-            soup: BeautifulSoup object of the results page
+            chunks: HTML of the results page as byte chunks (e.g. Response.iter_content)
             
         Returns:
             List of record dictionaries
         """
         records = []
-        
-        tables = soup.find_all('table')
-        
-        if not tables:
-            table_divs = soup.find_all('div', class_=lambda x: x and 'table' in x.lower())
-            if table_divs:
+        first_row = True
+        # Rows outside a tbody, held until their table closes and it is known
+        # whether the table has a tbody
+        pending = {}
+        
+        parser = lxml.etree.HTMLPullParser(events=('end',), tag=('tr', 'table'), **_HTML_PARSER_OPTIONS)
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+                first_row = self._extract_rows(parser.read_events(), records, first_row, pending)
+            doc = parser.close()
+            # Rows left open at end of input only end when the parser is closed
+            first_row = self._extract_rows(parser.read_events(), records, first_row, pending)
+        except lxml.etree.LxmlError as e:
+            self.logger.warning(f"Could not parse results page: {e}")
+            return records
+        
+        if first_row:
+            if doc is not None and _TABLE_DIV_XPATH(doc):
                 self.logger.debug("Found div-based table structure")
-        
-        rows = []
-        for table in tables:
-            tbody = table.find('tbody')
-            if tbody:
-                rows.extend(tbody.find_all('tr'))
-            else:
-                rows.extend(table.find_all('tr'))
-        
-        if not rows:
-            no_results = soup.find(string=lambda x: x and ('no results' in x.lower() or 'no records' in x.lower()))
-            if no_results:
+            
+            if doc is not None and _NO_RESULTS_XPATH(doc):
                 self.logger.info("No results found")
                 return []
             
             self.logger.warning("Could not find results table")
-            return []
         
-        if rows:
-            first_row = rows[0]
-            if all(cell.name == 'th' for cell in first_row.find_all(['th', 'td'])):
-                rows = rows[1:]
+        return records
+    
+    def _extract_rows(self, events, records: List[Dict[str, Any]], first_row: bool,
+                      pending: Dict[Any, List[Any]]) -> bool:
+        """
+        Extract records from completed <tr> elements, freeing each row afterwards.
         
-        for row in rows:
+        Rows whose parent is a <tbody> are extracted right away. Other rows in a
+        table are held in `pending` until the table ends, then extracted only if
+        the table had no tbody. Rows outside any table are dropped.
+        
+        Args:
+            events: (event, element) pairs for <tr> and <table> read from the pull parser
+            records: List that extracted records are appended to
+            first_row: Whether no row has been seen yet (a leading all-<th> row is a header)
+            pending: Table element -> rows outside its tbody, carried across calls
+            
+        Returns:
+            Updated first_row flag
+        """
+        for _, elem in events:
+            if elem.tag == 'table':
+                rows = pending.pop(elem, [])
+                if elem.find('tbody') is not None:
+                    for row in rows:
+                        row.clear()
+                    continue
+                for row in rows:
+                    first_row = self._extract_row(row, records, first_row)
+                continue
+            
+            table = next(elem.iterancestors('table'), None)
+            if table is None:
+                elem.clear()
+            elif elem.getparent().tag == 'tbody':
+                first_row = self._extract_row(elem, records, first_row)
+            else:
+                pending.setdefault(table, []).append(elem)
+        
+        return first_row
+    
+    def _extract_row(self, row, records: List[Dict[str, Any]], first_row: bool) -> bool:
+        """
+        Extract a record from one result row, then free the row.
+        
+        Args:
+            row: <tr> element
+            records: List that the extracted record is appended to
+            first_row: Whether no row has been seen yet (a leading all-<th> row is a header)
+            
+        Returns:
+            Updated first_row flag
+        """
+        is_header = first_row and all(cell.tag == 'th' for cell in _CELL_XPATH(row))
+        
+        if not is_header:
             try:
                 record = self.extract_record_data(row)
                 if record:
                     records.append(record)
             except Exception as e:
                 self.logger.warning(f"Error extracting record from row: {e}")
-                continue
         
-        return records
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+        
+        return False
     
     def extract_record_data(self, row) -> Optional[Dict[str, Any]]:
         """
         Extract structured data from a results table row.
         
         Args:
-            row: BeautifulSoup element representing a table row
+            row: lxml element representing a table row
             
         Returns:
             Dictionary with record data in NC format, or None if extraction fails
         """
-        cells = row.find_all(['td', 'th'])
+        cells = _CELL_XPATH(row)
         
         if len(cells) < 3:  
             return None
@@ -301,9 +647,12 @@ class SeminoleScraper:
             "consideration": None
         }
         
-        cell_texts = [cell.get_text(strip=True) for cell in cells]
+        # Same text as bs4's get_text(strip=True): each text node stripped, then joined.
+        # The second loop below picks up the cells the first one didn't reach; it still
+        # builds their text, but skips every per-field check except consideration.
+        cell_texts = (''.join(t.strip() for t in cell.itertext()) for cell in cells)
         
-        for i, text in enumerate(cell_texts):
+        for text in cell_texts:
             if not text:
                 continue
             
@@ -316,23 +665,14 @@ class SeminoleScraper:
                 if parsed_date:
                     record["date"] = parsed_date
             
-            if not record["doc_type"] and len(text) < 50 and any(word.isupper() for word in text.split()):
+            # Some word must be all caps: an all-caps cell qualifies outright, and a
+            # cell without uppercase letters (text == lower) can't, so the per-word
+            # scan only runs for mixed-case text
+            if not record["doc_type"] and len(text) < 50 and (
+                    text.isupper() or (text.lower() != text and any(word.isupper() for word in text.split()))):
                 record["doc_type"] = text.upper()
                 record["original_doc_type"] = text
-
-                doc_lower = text.lower()
-                if 'deed' in doc_lower:
-                    record["doc_category"] = "deed"
-                elif 'trust' in doc_lower:
-                    record["doc_category"] = "trust"
-                elif 'mortgage' in doc_lower:
-                    record["doc_category"] = "mortgage"
-                elif 'release' in doc_lower or 'satisfaction' in doc_lower:
-                    record["doc_category"] = "release"
-                elif 'lien' in doc_lower:
-                    record["doc_category"] = "lien"
-                else:
-                    record["doc_category"] = "misc"
+                record["doc_category"] = _doc_category(text)
             
             if not record["book"] and (text.isdigit() or (len(text) < 10 and text.replace(' ', '').isalnum())):
                 record["book"] = text
@@ -342,19 +682,24 @@ class SeminoleScraper:
             
             if len(text) > 5 and ',' in text:
                 if not record["grantors"]:
-                    names = [normalize_name(n.strip()) for n in text.split(',')]
-                    record["grantors"] = [n for n in names if n]
+                    record["grantors"] = normalize_names(text)
                 elif not record["grantees"]:
-                    names = [normalize_name(n.strip()) for n in text.split(',')]
-                    record["grantees"] = [n for n in names if n]
+                    record["grantees"] = normalize_names(text)
+            
+            amount = _parse_consideration(text)
+            if amount is not None:
+                record["consideration"] = amount
             
-            if '$' in text or (text.replace(',', '').replace('.', '').isdigit() and len(text) > 3):
-                try:
-                    amount_str = text.replace('$', '').replace(',', '').strip()
-                    if amount_str.replace('.', '').isdigit():
-                        record["consideration"] = float(amount_str)
-                except (ValueError, AttributeError):
-                    pass
+            if (record["instrument_number"] and record["date"] and record["doc_type"] and record["book"]
+                    and record["page"] and record["grantors"] and record["grantees"]):
+                break
+        
+        # Every other field keeps its first match; only consideration (last match wins)
+        # can still change, so the remaining cells get just that check
+        for text in cell_texts:
+            amount = _parse_consideration(text)
+            if amount is not None:
+                record["consideration"] = amount
         
         if record["instrument_number"] or record["doc_type"] or record["date"]:
             return record
@@ -383,8 +728,7 @@ class SeminoleScraper:
             elif 'records' in data:
                 items = data['records']
             else:
-                items = [v for v in data.values() if isinstance(v, list)]
-                items = items[0] if items else []
+                items = next((v for v in data.values() if isinstance(v, list)), [])
         else:
             self.logger.warning(f"Unexpected API response format: {type(data)}")
             return []
@@ -437,21 +781,7 @@ class SeminoleScraper:
         
         if record["original_doc_type"]:
             record["doc_type"] = record["original_doc_type"].upper()
-            doc_lower = record["original_doc_type"].lower()
-            if 'deed' in doc_lower:
-                record["doc_category"] = "deed"
-            elif 'mortgage' in doc_lower:
-                record["doc_category"] = "mortgage"
-            elif 'trust' in doc_lower:
-                record["doc_category"] = "trust"
-            elif 'judgment' in doc_lower:
-                record["doc_category"] = "judgment"
-            elif 'order' in doc_lower:
-                record["doc_category"] = "order"
-            elif 'notice' in doc_lower:
-                record["doc_category"] = "notice"
-            else:
-                record["doc_category"] = "misc"
+            record["doc_category"] = _doc_category(record["original_doc_type"])
         
         date_str = item.get('file_date')
         if date_str:
@@ -482,12 +812,12 @@ class SeminoleScraper:
         
         return None
     
-    def _handle_pagination(self, soup: BeautifulSoup, search_params: Dict[str, str]) -> List[Dict[str, Any]]:
+    def _handle_pagination(self, doc: lxml.html.HtmlElement, search_params: Dict[str, str]) -> List[Dict[str, Any]]:
         """
         Handle pagination if multiple pages of results exist.
         
         Args:
-            soup: BeautifulSoup object of current results page
+            doc: Parsed (lxml) current results page
             search_params: Original search parameters
             
         Returns:
@@ -495,15 +825,12 @@ class SeminoleScraper:
         """
         all_records = []
         
-        next_links = soup.find_all('a', string=lambda x: x and ('next' in x.lower() or '>' in x))
+        next_links = _NEXT_OR_ARROW_LINK_XPATH(doc)
         
-        page_links = soup.find_all('a', href=lambda x: x and ('page' in x.lower() or 'p=' in x.lower()))
+        page_links = _PAGE_LINK_XPATH(doc)
         
         if not next_links and not page_links:
-            pagination_divs = soup.find_all(['div', 'span'], class_=lambda x: x and 'pagination' in str(x).lower())
-            if pagination_divs:
-                for div in pagination_divs:
-                    next_links.extend(div.find_all('a', string=lambda x: x and 'next' in x.lower()))
+            next_links.extend(_PAGINATION_NEXT_LINK_XPATH(doc))
         
         page_num = 2
         max_pages = 10
@@ -527,8 +854,7 @@ class SeminoleScraper:
                 page_response.raise_for_status()
                 time.sleep(self.delay)
                 
-                page_soup = BeautifulSoup(page_response.content, 'html.parser')
-                page_records = self._parse_results_table(page_soup)
+                page_records = self._parse_results_table([page_response.content])
                 
                 if not page_records:
                     break
@@ -536,7 +862,7 @@ class SeminoleScraper:
                 all_records.extend(page_records)
                 self.logger.debug(f"Found {len(page_records)} records on page {page_num}")
                 
-                has_next = page_soup.find('a', string=lambda x: x and 'next' in x.lower() if x else False)
+                has_next = _NEXT_LINK_XPATH(lxml.html.fromstring(page_response.content, parser=_HTML_PARSER))
                 if not has_next:
                     break
                 
@@ -552,32 +878,41 @@ class SeminoleScraper:
         return all_records
 
 
-def scrape_and_save(name: str, output_path: str):
+def scrape_and_save(name: Union[str, List[str]], output_path: str, use_cache: bool = True):
     """
-    Scrape records for a name and save to JSON file.
+    Scrape records for one or more names and save to JSON file.
+    
+    Several names are searched concurrently; their records are saved as one list.
     
     Args:
-        name: Name to search for
+        name: Name (or list of names) to search for
         output_path: Path to save results
+        use_cache: Whether to reuse cached HTTP responses (requires requests-cache)
     """
     setup_logging()
     logger = logging.getLogger(__name__)
     
-    logger.info(f"Starting scrape for name: {name}")
+    names = [name] if isinstance(name, str) else list(name)
+    label = ", ".join(f"'{n}'" for n in names)
     
-    scraper = SeminoleScraper(delay=1.0)
+    logger.info(f"Starting scrape for name: {label}")
+    
+    scraper = SeminoleScraper(delay=1.0, use_cache=use_cache)
     
     try:
-        records = scraper.search_by_name(name)
-        logger.info(f"Found {len(records)} records for '{name}'")
+        if len(names) == 1:
+            records = scraper.search_by_name(names[0])
+        else:
+            results = scraper.search_many(names)
+            records = [record for n in names for record in results[n]]
+        logger.info(f"Found {len(records)} records for {label}")
         
-        with open(output_path, 'w') as f:
-            json.dump(records, f, indent=2)
+        write_json(records, output_path)
         
         logger.info(f"Results saved to {output_path}")
         
     except Exception as e:
-        logger.error(f"Error scraping for '{name}': {e}", exc_info=True)
+        logger.error(f"Error scraping for {label}: {e}", exc_info=True)
         raise
 
 
@@ -585,11 +920,13 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Scrape Seminole County property records")
-    parser.add_argument("--name", "-n", required=True,
-                       help="Name to search for")
+    parser.add_argument("--name", "-n", required=True, nargs="+",
+                       help="Name(s) to search for; several names are searched concurrently")
     parser.add_argument("--output", "-o", default="outputs/seminole_test_results.json",
                        help="Path to output JSON file")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always fetch fresh responses instead of using the on-disk HTTP cache")
     
     args = parser.parse_args()
     
-    scrape_and_save(args.name, args.output)
+    scrape_and_save(args.name, args.output, use_cache=not args.no_cache)
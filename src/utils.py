@@ -1,10 +1,17 @@
 """Shared utilities for data processing."""
 
+import functools
 import json
 import logging
-from typing import Iterator, Dict, Any, Optional
+import re
+from typing import Iterator, Dict, Any, List, Optional, Union
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def setup_logging(level=logging.INFO):
     """Configure logging for the application."""
@@ -15,26 +22,102 @@ def setup_logging(level=logging.INFO):
     )
 
 
-def stream_jsonl(filepath: str) -> Iterator[Dict[Any, Any]]:
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode JSON, using orjson when it is installed.
+    
+    Args:
+        data: JSON document as str or UTF-8 bytes
+        
+    Returns:
+        Decoded Python object
+        
+    Raises:
+        json.JSONDecodeError: If the document is invalid (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(obj: Any, output_path: str):
+    """
+    Write an object as pretty-printed (2-space indent) UTF-8 JSON.
+    
+    Uses orjson when it is installed, otherwise the stdlib encoder; both
+    produce the same layout.
+    
+    Args:
+        obj: JSON-serializable object
+        output_path: Path to output JSON file
+    """
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+def stream_jsonl(filepath: str, start: int = 0, end: Optional[int] = None,
+                 bufsize: int = 1 << 20) -> Iterator[Dict[Any, Any]]:
     """
     Stream JSONL file line-by-line.
     
+    The file is read in `bufsize` blocks and split on newlines, rather than
+    iterated line-by-line, so per-line Python overhead stays low.
+    
+    When a byte range is given, only lines that *start* inside [start, end)
+    are yielded, so adjacent ranges partition the file without overlap.
+    
     Args:
         filepath: Path to JSONL file
+        start: Byte offset to start reading from
+        end: Byte offset to stop at (None reads to end of file)
+        bufsize: Read block size in bytes
         
     Yields:
         Dictionary representing each record
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError as e:
-                logging.warning(f"Error parsing line {line_num}: {e}")
-                continue
+    with open(filepath, 'rb') as f:
+        pos = start
+        if start > 0:
+            # Skip the line straddling `start`; it belongs to the previous range
+            f.seek(start - 1)
+            pos = start - 1 + len(f.readline())
+        
+        line_num = 0
+        buf = b''
+        while True:
+            chunk = f.read(bufsize)
+            if chunk:
+                lines = (buf + chunk).split(b'\n')
+                buf = lines.pop()
+            else:
+                lines = [buf] if buf else []
+            
+            if end is not None:
+                # Keep only lines starting before `end` (+1 per line for the '\n')
+                for i, line in enumerate(lines):
+                    if pos >= end:
+                        lines = lines[:i]
+                        chunk = b''
+                        break
+                    pos += len(line) + 1
+            
+            for line_num, line in enumerate(lines, line_num + 1):
+                # JSON decoders accept surrounding whitespace ('\r', indentation),
+                # so only blank lines need skipping; no stripped copy is made
+                if not line or line.isspace():
+                    continue
+                try:
+                    yield json_loads(line)
+                except json.JSONDecodeError as e:
+                    logging.warning(f"Error parsing line {line_num}: {e}")
+                    continue
+            
+            if not chunk:
+                break
 
 
 def normalize_name(name: str) -> str:
@@ -52,10 +135,52 @@ def normalize_name(name: str) -> str:
     return name.strip().upper()
 
 
+def normalize_names(text: str, sep: str = ',') -> List[str]:
+    """
+    Split a delimited list of names and normalize each one.
+    
+    The whole string is upper-cased once before splitting instead of once per
+    name; empty entries are dropped.
+    
+    Args:
+        text: Delimited names, e.g. "SMITH JOHN, Doe Jane"
+        sep: Delimiter between names
+        
+    Returns:
+        List of uppercase normalized names
+    """
+    return [name for name in (part.strip() for part in text.upper().split(sep)) if name]
+
+
+# strptime formats tried in order; Seminole API timestamps first
+_DATE_FORMATS = (
+    "%m/%d/%Y %I:%M:%S %p",  # e.g., "6/1/2007 2:58:08 PM"
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M:%S",     # e.g., "6/1/2007 14:58:08"
+    "%m/%d/%Y %I:%M %p",     # e.g., "6/1/2007 2:58 PM"
+    "%m/%d/%Y %H:%M",        # e.g., "6/1/2007 14:58"
+)
+
+# Fast paths for the common shapes, built from regex groups without strptime.
+# Strings they don't match (or out-of-range values) fall through to _DATE_FORMATS.
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:T(\d{2}):(\d{2}):(\d{2}))?', re.ASCII)
+_MDY_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})(?: (\d{1,2}):(\d{2}):(\d{2}) ([AaPp])[Mm])?', re.ASCII)
+
+
+@functools.lru_cache(maxsize=65536)
 def parse_date(date_str: str) -> Optional[str]:
     """
     Parse and format date to ISO 8601.
     
+    Results are memoized, since the same date strings repeat across records.
+    
     Args:
         date_str: Date string in various formats
         
@@ -65,23 +190,30 @@ def parse_date(date_str: str) -> Optional[str]:
     if not date_str:
         return None
     
-    formats = [
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S.%f",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%d",
-        "%Y/%m/%d",
-        "%m/%d/%Y",
-        "%m/%d/%Y %I:%M:%S %p",  # e.g., "6/1/2007 2:58:08 PM"
-        "%m/%d/%Y %I:%M:%S %p",  # e.g., "6/1/2007 2:58:08 PM"
-        "%m/%d/%Y %H:%M:%S",     # e.g., "6/1/2007 14:58:08"
-        "%m/%d/%Y %I:%M %p",     # e.g., "6/1/2007 2:58 PM"
-        "%m/%d/%Y %H:%M",        # e.g., "6/1/2007 14:58"
-    ]
-    
-    for fmt in formats:
+    match = _ISO_DATE_RE.fullmatch(date_str)
+    if match:
+        year, month, day, hour, minute, second = match.groups()
+        try:
+            return datetime(int(year), int(month), int(day),
+                            int(hour or 0), int(minute or 0), int(second or 0)).isoformat()
+        except ValueError:
+            pass
+    
+    match = _MDY_DATE_RE.fullmatch(date_str)
+    if match:
+        month, day, year, hour, minute, second, meridiem = match.groups()
+        try:
+            if hour is None:
+                return datetime(int(year), int(month), int(day)).isoformat()
+            hour = int(hour)
+            if 1 <= hour <= 12:
+                hour = hour % 12 + (12 if meridiem in 'Pp' else 0)
+                return datetime(int(year), int(month), int(day),
+                                hour, int(minute), int(second)).isoformat()
+        except ValueError:
+            pass
+    
+    for fmt in _DATE_FORMATS:
         try:
             dt = datetime.strptime(date_str, fmt)
             return dt.isoformat()